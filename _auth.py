@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shared auth helpers for the backend test scripts
+"""
+
+import os
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Dict, Tuple
+
+import orjson
+import requests
+from pymongo import MongoClient
+
+BASE_URL = "https://ticketmaster-70.preview.emergentagent.com"
+TOKEN_CACHE = Path.home() / ".cache" / "eventmgmt" / "token.json"
+
+# One driver connection per process, shared by every script that seeds test data
+mongo = MongoClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'), serverSelectionTimeoutMS=2000)
+test_db = mongo.test_database
+
+def bearer_headers(token: str) -> Dict[str, str]:
+    """Authorization header for a session token"""
+    return {'Authorization': f'Bearer {token}'}
+
+def new_session() -> requests.Session:
+    """Keep-alive HTTP session preconfigured for the JSON API"""
+    session = requests.Session()
+    session.headers.update({'Content-Type': 'application/json'})
+    return session
+
+def seed_admin_session(user_id: str, session_token: str, email: str) -> datetime:
+    """Insert an admin user and a 7-day session for it, returning the expiry"""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=7)
+
+    test_db.users.insert_one({
+        "id": user_id,
+        "email": email,
+        "name": "Test Admin User",
+        "picture": "https://via.placeholder.com/150",
+        "role": "admin",
+        "created_at": now.isoformat()
+    })
+    test_db.user_sessions.insert_one({
+        "user_id": user_id,
+        "session_token": session_token,
+        "expires_at": expires_at,
+        "created_at": now.isoformat()
+    })
+    return expires_at
+
+def load_token_cache() -> Dict[str, Dict[str, str]]:
+    """Cached admin tokens keyed by base URL; empty if the file is missing or corrupt"""
+    try:
+        cache = orjson.loads(TOKEN_CACHE.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def get_or_create_admin_session(base_url: str = BASE_URL) -> Tuple[requests.Session, str]:
+    """Reuse the cached admin token while the backend still accepts it, otherwise seed a new one"""
+    session = new_session()
+    cache, token = load_token_cache(), None
+
+    # An unreadable or malformed cache entry is treated as a miss
+    try:
+        cached = cache[base_url]
+        if datetime.fromisoformat(cached["expires_at"]) - timedelta(minutes=10) > datetime.now(timezone.utc):
+            token = cached["token"]
+    except (KeyError, TypeError, ValueError):
+        pass
+    if token:
+        response = session.get(f"{base_url}/api/auth/me", headers=bearer_headers(token), timeout=30)
+        if response.status_code == 200:
+            return session, token
+
+    stamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+    token = f"session_admin_cached_{stamp}"
+    expires_at = seed_admin_session(f"test-admin-cached-{stamp}", token, f"test.admin.cached.{stamp}@example.com")
+
+    cache[base_url] = {"token": token, "expires_at": expires_at.isoformat()}
+    TOKEN_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    TOKEN_CACHE.write_bytes(orjson.dumps(cache))
+    return session, token
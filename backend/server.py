@@ -1,18 +1,27 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Request, Response, Depends, Header
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Response, Depends, Header, Query
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
+import asyncio
+import hashlib
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
-import uuid
+import msgspec
+from cachetools import LRUCache, TTLCache
 from datetime import datetime, timezone, timedelta
-import qrcode
+import segno
 from io import BytesIO
-import requests
+import httpx
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
 import stripe
 
 ROOT_DIR = Path(__file__).parent
@@ -20,44 +29,93 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
+# Multi-document transactions need a replica set or sharded cluster; set at startup
+mongo_supports_transactions = False
 
 # Stripe setup
 stripe_api_key = os.environ.get('STRIPE_API_KEY')
+stripe_webhook_secret = os.environ.get('STRIPE_WEBHOOK_SECRET')
+
+# Stripe's HTTPX transport backs the *_async methods, so payment calls are awaited
+# natively instead of blocking the event loop
+stripe_client = stripe.StripeClient(stripe_api_key, http_client=stripe.HTTPXClient()) if stripe_api_key else None
+
+# Optional Redis cache for public event reads; disabled when REDIS_URL is unset
+redis_url = os.environ.get('REDIS_URL')
+redis_client = aioredis.from_url(redis_url) if redis_url else None
+EVENTS_CACHE_TTL = 60
+
+# Pooled HTTP/2 client for the Emergent auth service, reused across sign-ins
+auth_client = httpx.AsyncClient(
+    base_url="https://demobackend.emergentagent.com",
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=5.0
+)
+
+# Shared msgspec encoder for JSON responses
+json_encoder = msgspec.json.Encoder()
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response rendered with msgspec instead of the stdlib json module"""
+    def render(self, content: Any) -> bytes:
+        return json_encoder.encode(content)
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=MsgspecJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 # ============ MODELS ============
 
-class User(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+def _utcnow_iso() -> str:
+    """Current UTC time as the ISO string stored in Mongo"""
+    return datetime.now(timezone.utc).isoformat()
+
+# Random bytes for _fast_uuid, read from os.urandom 1024 UUIDs at a time
+_UUID_BATCH = 1024
+_uuid_pool = b""
+_uuid_offset = 0
+
+def _fast_uuid() -> str:
+    """Random UUID4 string without a urandom syscall or UUID object per call"""
+    global _uuid_pool, _uuid_offset
+    if _uuid_offset >= len(_uuid_pool):
+        _uuid_pool = os.urandom(16 * _UUID_BATCH)
+        _uuid_offset = 0
+    h = _uuid_pool[_uuid_offset:_uuid_offset + 16].hex()
+    _uuid_offset += 16
+    # Set the version (4) and RFC 4122 variant nibbles
+    variant = "89ab"[int(h[16], 16) & 3]
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}"
+
+# User and UserSession are resolved on every authenticated request, so they are
+# msgspec structs; the remaining models stay Pydantic for the API schema.
+class User(msgspec.Struct, kw_only=True):
+    id: str = msgspec.field(default_factory=_fast_uuid)
     email: str
     name: str
     picture: Optional[str] = None
     role: str = "attendee"  # attendee, organizer, admin
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: str = msgspec.field(default_factory=_utcnow_iso)
 
-class UserSession(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class UserSession(msgspec.Struct, kw_only=True):
     user_id: str
     session_token: str
     expires_at: datetime
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: str = msgspec.field(default_factory=_utcnow_iso)
 
 class Category(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_fast_uuid)
     name: str
 
 class Event(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_fast_uuid)
     creator_id: str
     title: str
     description: str
@@ -67,15 +125,18 @@ class Event(BaseModel):
     category: str
     image_url: Optional[str] = None
     status: str = "active"  # active, cancelled
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: str = Field(default_factory=_utcnow_iso)
 
 class EventWithCreator(Event):
     creator_name: str
     creator_email: str
 
+class EventListItem(EventWithCreator):
+    description: str = Field(description="First 200 characters of the description")
+
 class TicketType(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_fast_uuid)
     event_id: str
     name: str
     price: float  # 0 for free tickets
@@ -84,16 +145,17 @@ class TicketType(BaseModel):
 
 class Booking(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_fast_uuid)
     user_id: str
     event_id: str
     ticket_type_id: str
     quantity: int
     total_price: float
-    status: str = "pending"  # pending, confirmed, cancelled
+    status: str = "pending"  # pending, confirmed, cancelled, refund_required
     payment_intent_id: Optional[str] = None
     qr_code_data: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    hold_expires_at: Optional[datetime] = None  # when a pending booking's seats are released
+    created_at: str = Field(default_factory=_utcnow_iso)
 
 class BookingWithDetails(Booking):
     event_title: str
@@ -103,7 +165,7 @@ class BookingWithDetails(Booking):
 
 class PaymentTransaction(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_fast_uuid)
     session_id: str
     booking_id: str
     user_id: str
@@ -112,8 +174,8 @@ class PaymentTransaction(BaseModel):
     payment_status: str = "pending"  # pending, paid, failed
     status: str = "initiated"  # initiated, completed, expired
     metadata: Optional[Dict[str, Any]] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: str = Field(default_factory=_utcnow_iso)
+    updated_at: str = Field(default_factory=_utcnow_iso)
 
 # ============ INPUT MODELS ============
 
@@ -163,6 +225,20 @@ class UserWithRole(BaseModel):
 
 # ============ AUTH HELPERS ============
 
+# Role sets checked on every guarded request, built once
+ROLES = frozenset({"attendee", "organizer", "admin"})
+EVENT_CREATOR_ROLES = frozenset({"organizer", "admin"})
+SELF_SELECTABLE_ROLES = frozenset({"attendee", "organizer"})
+
+# Resolved users keyed by session token, so authenticated requests skip Mongo
+session_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+def invalidate_user_sessions(user_id: str):
+    """Drop cached sessions for a user whose role or session changed"""
+    for token, cached_user in list(session_cache.items()):
+        if cached_user.id == user_id:
+            session_cache.pop(token, None)
+
 async def get_current_user(request: Request, authorization: Optional[str] = Header(None)) -> Optional[User]:
     """Get current user from session token (cookie or header)"""
     session_token = request.cookies.get("session_token")
@@ -174,19 +250,37 @@ async def get_current_user(request: Request, authorization: Optional[str] = Head
     if not session_token:
         return None
     
-    session = await db.user_sessions.find_one({"session_token": session_token})
-    if not session or datetime.fromisoformat(session['expires_at']) < datetime.now(timezone.utc):
+    user = session_cache.get(session_token)
+    if user:
+        return user
+    
+    # Resolve session and user in one round-trip
+    sessions = await db.user_sessions.aggregate([
+        {"$match": {"session_token": session_token}},
+        {"$limit": 1},
+        {"$lookup": {"from": "users", "localField": "user_id", "foreignField": "id", "as": "user"}},
+        {"$unwind": "$user"}
+    ]).to_list(1)
+    if not sessions:
         return None
     
-    user_doc = await db.users.find_one({"id": session["user_id"]}, {"_id": 0})
-    if not user_doc:
+    session = sessions[0]
+    expires_at = session['expires_at']
+    if isinstance(expires_at, str):
+        # Sessions created before expires_at was stored as a BSON date
+        expires_at = datetime.fromisoformat(expires_at)
+    if expires_at < datetime.now(timezone.utc):
         return None
     
-    # Convert ISO string timestamps back to datetime
-    if isinstance(user_doc.get('created_at'), str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    
-    return User(**user_doc)
+    user_doc = session["user"]
+    user_doc.pop("_id", None)
+    if isinstance(user_doc.get("created_at"), datetime):
+        # Users written by other tools store created_at as a BSON date
+        user_doc["created_at"] = user_doc["created_at"].isoformat()
+
+    user = msgspec.convert(user_doc, User)
+    session_cache[session_token] = user
+    return user
 
 async def require_auth(user: Optional[User] = Depends(get_current_user)) -> User:
     """Require authentication"""
@@ -196,7 +290,7 @@ async def require_auth(user: Optional[User] = Depends(get_current_user)) -> User
 
 async def require_organizer(user: User = Depends(require_auth)) -> User:
     """Require organizer or admin role"""
-    if user.role not in ["organizer", "admin"]:
+    if user.role not in EVENT_CREATOR_ROLES:
         raise HTTPException(status_code=403, detail="Organizer or admin role required")
     return user
 
@@ -216,8 +310,8 @@ async def create_session(request: Request, response: Response):
         raise HTTPException(status_code=400, detail="Missing session ID")
     
     # Call Emergent auth service
-    auth_response = requests.get(
-        "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
+    auth_response = await auth_client.get(
+        "/auth/v1/env/oauth/session-data",
         headers={"X-Session-ID": session_id}
     )
 
@@ -230,25 +324,33 @@ async def create_session(request: Request, response: Response):
 
     
     # Check if user exists
-    existing_user = await db.users.find_one({"email": user_data["email"]}, {"_id": 0})
+    existing_user = await db.users.find_one({"email": user_data["email"]}, {"_id": 0, "id": 1})
     
     if not existing_user:
         # Check if this is the first user (make them admin)
         user_count = await db.users.count_documents({})
         default_role = "admin" if user_count == 0 else "attendee"
         
-        # Create new user
+        # Create new user. Sign-in can be posted twice for the same session
+        # (React StrictMode runs effects twice), so insert by upsert on the
+        # unique email and keep whichever user document was written first.
         user = User(
             email=user_data["email"],
             name=user_data["name"],
             picture=user_data.get("picture"),
             role=default_role
         )
-        user_dict = user.model_dump()
-        user_dict['created_at'] = user_dict['created_at'].isoformat()
-        await db.users.insert_one(user_dict)
-        user_id = user.id
-        is_new_user = True
+        user_dict = msgspec.to_builtins(user)
+        del user_dict["email"]
+        stored_user = await db.users.find_one_and_update(
+            {"email": user.email},
+            {"$setOnInsert": user_dict},
+            projection={"_id": 0, "id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        user_id = stored_user["id"]
+        is_new_user = user_id == user.id
     else:
         user_id = existing_user["id"]
         is_new_user = False
@@ -263,11 +365,15 @@ async def create_session(request: Request, response: Response):
         expires_at=expires_at
     )
     
-    session_dict = session.model_dump()
-    session_dict['expires_at'] = session_dict['expires_at'].isoformat()
-    session_dict['created_at'] = session_dict['created_at'].isoformat()
-    
-    await db.user_sessions.insert_one(session_dict)
+    # Keep expires_at a datetime so it is stored as a BSON date for the TTL index
+    session_dict = msgspec.to_builtins(session, builtin_types=(datetime,))
+    del session_dict["session_token"]
+    # A repeated exchange of the same session is a no-op rather than a duplicate key
+    await db.user_sessions.update_one(
+        {"session_token": session_token},
+        {"$setOnInsert": session_dict},
+        upsert=True
+    )
     
     # Set cookie
     response.set_cookie(
@@ -285,13 +391,14 @@ async def create_session(request: Request, response: Response):
 @api_router.get("/auth/me")
 async def get_me(user: User = Depends(require_auth)):
     """Get current user info"""
-    return user
+    return MsgspecJSONResponse(user)
 
 @api_router.post("/auth/logout")
 async def logout(request: Request, response: Response):
     """Logout user"""
     session_token = request.cookies.get("session_token")
     if session_token:
+        session_cache.pop(session_token, None)
         await db.user_sessions.delete_one({"session_token": session_token})
     
     response.delete_cookie("session_token", path="/")
@@ -300,7 +407,7 @@ async def logout(request: Request, response: Response):
 @api_router.patch("/auth/select-role")
 async def select_role(role_data: RoleUpdateRequest, user: User = Depends(require_auth)):
     """Allow user to select their role (attendee or organizer) during signup"""
-    if role_data.role not in ["attendee", "organizer"]:
+    if role_data.role not in SELF_SELECTABLE_ROLES:
         raise HTTPException(status_code=400, detail="Invalid role. Must be 'attendee' or 'organizer'")
     
     # Don't allow changing from admin
@@ -312,16 +419,34 @@ async def select_role(role_data: RoleUpdateRequest, user: User = Depends(require
         {"id": user.id},
         {"$set": {"role": role_data.role}}
     )
+    invalidate_user_sessions(user.id)
     
     return {"success": True, "role": role_data.role}
 
 # ============ CATEGORY ROUTES ============
 
+# Categories are only written by init_categories, so the response is serialized
+# once and served from memory with an ETag
+categories_json: bytes = b"[]"
+categories_etag: str = ""
+
+async def refresh_categories_cache():
+    """Reload the pre-serialized categories response; call after category writes"""
+    global categories_json, categories_etag
+    categories = await db.categories.find({}, {"_id": 0}).to_list(1000)
+    categories_json = json_encoder.encode(categories)
+    categories_etag = f'"{hashlib.sha1(categories_json).hexdigest()}"'
+
 @api_router.get("/categories", response_model=List[Category])
-async def get_categories():
+async def get_categories(if_none_match: Optional[str] = Header(None)):
     """Get all categories"""
-    categories = await db.categories.find({}, {"_id": 0}).to_list(1000)
-    return categories
+    if not categories_etag:
+        await refresh_categories_cache()
+    
+    headers = {"ETag": categories_etag, "Cache-Control": "public, max-age=300"}
+    if if_none_match == categories_etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=categories_json, media_type="application/json", headers=headers)
 
 # Initialize default categories if empty
 @app.on_event("startup")
@@ -340,9 +465,53 @@ async def init_categories():
         ]
         for cat in default_categories:
             await db.categories.insert_one(cat.model_dump())
+    
+    await refresh_categories_cache()
 
 # ============ EVENT ROUTES ============
 
+# The cache is best-effort: Redis errors are logged and the read goes to Mongo
+async def events_cache_key(kind: str, *params) -> Optional[str]:
+    """Versioned Redis key for a cached event read, or None when caching is off"""
+    if not redis_client:
+        return None
+    try:
+        version = int(await redis_client.get("events:version") or 0)
+    except RedisError as e:
+        logger.warning("Events cache unavailable: %s", e)
+        return None
+    digest = hashlib.sha1(repr(params).encode()).hexdigest()
+    return f"events:{kind}:{version}:{digest}"
+
+async def get_cached_events(cache_key: Optional[str]) -> Optional[bytes]:
+    """Cached response body for an event read, if any"""
+    if not cache_key:
+        return None
+    try:
+        return await redis_client.get(cache_key)
+    except RedisError as e:
+        logger.warning("Events cache read failed: %s", e)
+        return None
+
+async def cache_events(cache_key: Optional[str], body: bytes):
+    """Store a response body for an event read"""
+    if not cache_key:
+        return
+    try:
+        await redis_client.set(cache_key, body, ex=EVENTS_CACHE_TTL)
+    except RedisError as e:
+        logger.warning("Events cache write failed: %s", e)
+
+async def invalidate_events_cache():
+    """Bump the namespace version so every cached event read is skipped"""
+    if not redis_client:
+        return
+    try:
+        await redis_client.incr("events:version")
+    except RedisError as e:
+        # Stale entries still expire after EVENTS_CACHE_TTL
+        logger.warning("Events cache invalidation failed: %s", e)
+
 @api_router.post("/events", response_model=Event)
 async def create_event(event_data: EventCreate, user: User = Depends(require_organizer)):
     """Create a new event (requires organizer or admin role)"""
@@ -352,39 +521,78 @@ async def create_event(event_data: EventCreate, user: User = Depends(require_org
     )
     
     event_dict = event.model_dump()
-    event_dict['created_at'] = event_dict['created_at'].isoformat()
     await db.events.insert_one(event_dict)
+    await invalidate_events_cache()
     
     return event
 
-@api_router.get("/events", response_model=List[EventWithCreator])
-async def get_events(category: Optional[str] = None, search: Optional[str] = None):
+# Fields shown on event list pages; full documents are only served by get_event
+EVENT_LIST_FIELDS = {
+    "_id": 0, "id": 1, "creator_id": 1, "title": 1, "date": 1, "location": 1,
+    "capacity": 1, "category": 1, "image_url": 1, "status": 1, "created_at": 1
+}
+MAX_PAGE_SIZE = 100
+# Requests without a limit keep the original 1000-item cap; the list pages do not page
+UNPAGED_LIMIT = 1000
+# Stable order for paged lists, so skip/limit pages neither repeat nor miss documents
+LIST_SORT = {"created_at": 1, "id": 1}
+
+@api_router.get("/events", response_model=List[EventListItem])
+async def get_events(
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0)
+):
     """Get all events with filters"""
+    if limit is None:
+        limit = UNPAGED_LIMIT
+    cache_key = await events_cache_key("list", category, search, skip, limit)
+    cached = await get_cached_events(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     query = {"status": "active"}
     if category:
         query["category"] = category
     if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
-        ]
-    
-    events = await db.events.find(query, {"_id": 0}).to_list(1000)
+        # $text uses the title/description text index instead of a regex scan
+        query["$text"] = {"$search": search}
     
-    # Add creator info
-    events_with_creator = []
-    for event in events:
-        creator = await db.users.find_one({"id": event["creator_id"]}, {"_id": 0})
-        if creator:
-            event["creator_name"] = creator["name"]
-            event["creator_email"] = creator["email"]
-            events_with_creator.append(EventWithCreator(**event))
+    pipeline = [{"$match": query}]
+    if search:
+        pipeline.append({"$sort": {"score": {"$meta": "textScore"}, "id": 1}})
+    else:
+        pipeline.append({"$sort": LIST_SORT})
+    
+    # Join creator info in a single aggregation instead of one query per event.
+    # List cards only show a preview of the description, so it is truncated.
+    events_with_creator = await db.events.aggregate(pipeline + [
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$lookup": {"from": "users", "localField": "creator_id", "foreignField": "id", "as": "creator"}},
+        {"$unwind": "$creator"},
+        {"$project": {
+            **EVENT_LIST_FIELDS,
+            "description": {"$substrCP": ["$description", 0, 200]},
+            "creator_name": "$creator.name",
+            "creator_email": "$creator.email"
+        }}
+    ]).to_list(limit)
     
-    return events_with_creator
+    # Documents come straight from Mongo, so skip response_model validation
+    body = json_encoder.encode(events_with_creator)
+    await cache_events(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 @api_router.get("/events/{event_id}", response_model=EventWithCreator)
 async def get_event(event_id: str):
     """Get single event"""
+    cache_key = await events_cache_key("item", event_id)
+    cached = await get_cached_events(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     event = await db.events.find_one({"id": event_id}, {"_id": 0})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -394,7 +602,9 @@ async def get_event(event_id: str):
         event["creator_name"] = creator["name"]
         event["creator_email"] = creator["email"]
     
-    return EventWithCreator(**event)
+    body = json_encoder.encode(event)
+    await cache_events(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 @api_router.put("/events/{event_id}", response_model=Event)
 async def update_event(event_id: str, update_data: EventUpdate, user: User = Depends(require_auth)):
@@ -410,9 +620,10 @@ async def update_event(event_id: str, update_data: EventUpdate, user: User = Dep
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
     if update_dict:
         await db.events.update_one({"id": event_id}, {"$set": update_dict})
+        await invalidate_events_cache()
     
     updated_event = await db.events.find_one({"id": event_id}, {"_id": 0})
-    return Event(**updated_event)
+    return MsgspecJSONResponse(updated_event)
 
 @api_router.delete("/events/{event_id}")
 async def delete_event(event_id: str, user: User = Depends(require_auth)):
@@ -426,13 +637,23 @@ async def delete_event(event_id: str, user: User = Depends(require_auth)):
         raise HTTPException(status_code=403, detail="Not authorized")
     
     await db.events.update_one({"id": event_id}, {"$set": {"status": "cancelled"}})
+    await invalidate_events_cache()
     return {"success": True}
 
 @api_router.get("/events/my-events/list", response_model=List[Event])
-async def get_my_events(user: User = Depends(require_auth)):
+async def get_my_events(
+    user: User = Depends(require_auth),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0)
+):
     """Get user's created events"""
-    events = await db.events.find({"creator_id": user.id}, {"_id": 0}).to_list(1000)
-    return [Event(**e) for e in events]
+    if limit is None:
+        limit = UNPAGED_LIMIT
+    # Event requires description, so it is projected alongside the list fields
+    events = await db.events.find(
+        {"creator_id": user.id}, {**EVENT_LIST_FIELDS, "description": 1}
+    ).sort(list(LIST_SORT.items())).skip(skip).limit(limit).to_list(limit)
+    return MsgspecJSONResponse(events)
 
 # ============ TICKET TYPE ROUTES ============
 
@@ -458,10 +679,21 @@ async def create_ticket_type(event_id: str, ticket_data: TicketTypeCreate, user:
 async def get_ticket_types(event_id: str):
     """Get ticket types for an event"""
     ticket_types = await db.ticket_types.find({"event_id": event_id}, {"_id": 0}).to_list(1000)
-    return [TicketType(**t) for t in ticket_types]
+    return MsgspecJSONResponse(ticket_types)
 
 # ============ BOOKING ROUTES ============
 
+# Paid bookings hold their seats until checkout completes or the hold lapses.
+# Stripe checkout sessions must stay open for at least 30 minutes.
+BOOKING_HOLD = timedelta(minutes=31)
+HOLD_SWEEP_INTERVAL = 60
+
+def get_stripe_client() -> stripe.StripeClient:
+    """Return the Stripe client, failing cleanly when payments are not configured"""
+    if not stripe_client:
+        raise HTTPException(status_code=503, detail="Payments not configured")
+    return stripe_client
+
 @api_router.post("/bookings", response_model=Dict[str, Any])
 async def create_booking(booking_data: BookingCreate, user: User = Depends(require_auth)):
     """Create a booking"""
@@ -470,41 +702,45 @@ async def create_booking(booking_data: BookingCreate, user: User = Depends(requi
     if not event or event["status"] != "active":
         raise HTTPException(status_code=404, detail="Event not found or inactive")
     
-    # Validate ticket type
-    ticket_type = await db.ticket_types.find_one({"id": booking_data.ticket_type_id}, {"_id": 0})
-    if not ticket_type or ticket_type["event_id"] != booking_data.event_id:
-        raise HTTPException(status_code=404, detail="Ticket type not found")
-    
-    # Check availability
-    available = ticket_type["quantity_available"] - ticket_type["quantity_sold"]
-    if available < booking_data.quantity:
+    # Reserve tickets atomically: the availability check and the increment are a
+    # single conditional update, so concurrent bookings cannot oversell
+    ticket_type = await db.ticket_types.find_one_and_update(
+        {
+            "id": booking_data.ticket_type_id,
+            "event_id": booking_data.event_id,
+            "$expr": {"$gte": [{"$subtract": ["$quantity_available", "$quantity_sold"]}, booking_data.quantity]}
+        },
+        {"$inc": {"quantity_sold": booking_data.quantity}},
+        projection={"_id": 0, "price": 1}
+    )
+    if not ticket_type:
+        exists = await db.ticket_types.count_documents(
+            {"id": booking_data.ticket_type_id, "event_id": booking_data.event_id}, limit=1
+        )
+        if not exists:
+            raise HTTPException(status_code=404, detail="Ticket type not found")
         raise HTTPException(status_code=400, detail="Not enough tickets available")
     
     total_price = ticket_type["price"] * booking_data.quantity
+    requires_payment = total_price > 0
     
-    # Create booking
+    # Create booking. Paid seats are only held until checkout; release_expired_holds
+    # returns them if payment never arrives.
     booking = Booking(
         user_id=user.id,
         event_id=booking_data.event_id,
         ticket_type_id=booking_data.ticket_type_id,
         quantity=booking_data.quantity,
         total_price=total_price,
-        status="pending" if total_price > 0 else "confirmed",
-        qr_code_data=str(uuid.uuid4()) if total_price == 0 else None
+        status="pending" if requires_payment else "confirmed",
+        qr_code_data=None if requires_payment else _fast_uuid(),
+        hold_expires_at=datetime.now(timezone.utc) + BOOKING_HOLD if requires_payment else None
     )
     
     booking_dict = booking.model_dump()
-    booking_dict['created_at'] = booking_dict['created_at'].isoformat()
     await db.bookings.insert_one(booking_dict)
     
-    # Update ticket sold count for free tickets
-    if total_price == 0:
-        await db.ticket_types.update_one(
-            {"id": booking_data.ticket_type_id},
-            {"$inc": {"quantity_sold": booking_data.quantity}}
-        )
-    
-    return {"booking": booking, "requires_payment": total_price > 0}
+    return {"booking": booking, "requires_payment": requires_payment}
 
 @api_router.post("/bookings/checkout")
 async def create_checkout_session(checkout_req: CheckoutRequest, request: Request, user: User = Depends(require_auth)):
@@ -519,46 +755,163 @@ async def create_checkout_session(checkout_req: CheckoutRequest, request: Reques
     if booking["status"] != "pending":
         raise HTTPException(status_code=400, detail="Booking already processed")
     
-    # Initialize Stripe
-    host_url = checkout_req.origin_url
-    webhook_url = f"{host_url}/api/webhook/stripe"
-    stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url=webhook_url)
+    stripe_checkout = get_stripe_client()
     
     # Create checkout session
-    success_url = f"{host_url}/booking-success?session_id={{{{CHECKOUT_SESSION_ID}}}}"
+    host_url = checkout_req.origin_url
+    success_url = f"{host_url}/booking-success?session_id={{CHECKOUT_SESSION_ID}}"
     cancel_url = f"{host_url}/events"
-    
-    checkout_request = CheckoutSessionRequest(
-        amount=booking["total_price"],
-        currency="usd",
-        success_url=success_url,
-        cancel_url=cancel_url,
-        metadata={"booking_id": booking["id"], "user_id": user.id}
-    )
-    
-    session: CheckoutSessionResponse = await stripe_checkout.create_checkout_session(checkout_request)
+    metadata = {"booking_id": booking["id"], "user_id": user.id}
+    # The checkout session closes when the seat hold lapses
+    hold_expires_at = datetime.now(timezone.utc) + BOOKING_HOLD
+    
+    session = await stripe_checkout.checkout.sessions.create_async(params={
+        "mode": "payment",
+        "line_items": [{
+            "price_data": {
+                "currency": "usd",
+                "unit_amount": round(booking["total_price"] * 100),
+                "product_data": {"name": f"Booking {booking['id']}"}
+            },
+            "quantity": 1
+        }],
+        "success_url": success_url,
+        "cancel_url": cancel_url,
+        "metadata": metadata,
+        "expires_at": int(hold_expires_at.timestamp())
+    })
     
     # Create payment transaction
     transaction = PaymentTransaction(
-        session_id=session.session_id,
+        session_id=session.id,
         booking_id=booking["id"],
         user_id=user.id,
         amount=booking["total_price"],
-        metadata=checkout_request.metadata
+        metadata=metadata
     )
     
     transaction_dict = transaction.model_dump()
-    transaction_dict['created_at'] = transaction_dict['created_at'].isoformat()
-    transaction_dict['updated_at'] = transaction_dict['updated_at'].isoformat()
-    await db.payment_transactions.insert_one(transaction_dict)
+    # Record the transaction and link the booking concurrently
+    await asyncio.gather(
+        db.payment_transactions.insert_one(transaction_dict),
+        db.bookings.update_one(
+            {"id": booking["id"], "status": "pending"},
+            {"$set": {"payment_intent_id": session.id, "hold_expires_at": hold_expires_at}}
+        )
+    )
+    
+    return {"url": session.url, "session_id": session.id}
+
+async def release_booking_hold(query: Dict[str, Any]) -> bool:
+    """Cancel a pending booking and return its held seats, at most once"""
+    # The status filter makes the release idempotent
+    booking = await db.bookings.find_one_and_update(
+        {**query, "status": "pending"},
+        {"$set": {"status": "cancelled"}, "$unset": {"hold_expires_at": ""}},
+        projection={"_id": 0, "ticket_type_id": 1, "quantity": 1}
+    )
+    if not booking:
+        return False
+    await db.ticket_types.update_one(
+        {"id": booking["ticket_type_id"]},
+        {"$inc": {"quantity_sold": -booking["quantity"]}}
+    )
+    return True
+
+async def release_expired_holds():
+    """Cancel pending bookings whose seat hold has lapsed"""
+    now = datetime.now(timezone.utc)
+    expired = await db.bookings.find(
+        {"status": "pending", "hold_expires_at": {"$lte": now}}, {"_id": 0, "id": 1}
+    ).to_list(None)
+    for booking in expired:
+        await release_booking_hold({"id": booking["id"], "hold_expires_at": {"$lte": now}})
+
+async def sweep_expired_holds():
+    """Release lapsed seat holds until the app shuts down"""
+    while True:
+        try:
+            await release_expired_holds()
+        except Exception:
+            logger.exception("Releasing expired booking holds failed")
+        await asyncio.sleep(HOLD_SWEEP_INTERVAL)
+
+async def confirm_paid_booking(booking_id: str, mongo_session=None) -> Optional[str]:
+    """Confirm a paid booking at most once, returning its resulting status"""
+    # Seats are still held, so confirming is a single guarded status flip
+    booking = await db.bookings.find_one_and_update(
+        {"id": booking_id, "status": "pending"},
+        {"$set": {"status": "confirmed", "qr_code_data": _fast_uuid()}, "$unset": {"hold_expires_at": ""}},
+        projection={"_id": 0, "id": 1},
+        session=mongo_session
+    )
+    if booking:
+        return "confirmed"
+    
+    # The hold lapsed before the payment arrived. Claim the booking first, so a
+    # concurrent confirmation cannot reserve its seats twice.
+    booking = await db.bookings.find_one_and_update(
+        {"id": booking_id, "status": "cancelled"},
+        {"$set": {"status": "refund_required"}},
+        projection={"_id": 0, "ticket_type_id": 1, "event_id": 1, "quantity": 1},
+        session=mongo_session
+    )
+    if not booking:
+        # Already confirmed or flagged by an earlier call
+        current = await db.bookings.find_one({"id": booking_id}, {"_id": 0, "status": 1}, session=mongo_session)
+        return current["status"] if current else None
+    
+    reserved = await db.ticket_types.update_one(
+        {
+            "id": booking["ticket_type_id"],
+            "event_id": booking["event_id"],
+            "$expr": {"$gte": [{"$subtract": ["$quantity_available", "$quantity_sold"]}, booking["quantity"]]}
+        },
+        {"$inc": {"quantity_sold": booking["quantity"]}},
+        session=mongo_session
+    )
+    if not reserved.modified_count:
+        # The charge stands and the booking stays flagged for a refund
+        logger.warning("Booking %s was paid after its seats were released and is sold out", booking_id)
+        return "refund_required"
     
-    # Update booking with payment intent
     await db.bookings.update_one(
-        {"id": booking["id"]},
-        {"$set": {"payment_intent_id": session.session_id}}
+        {"id": booking_id, "status": "refund_required"},
+        {"$set": {"status": "confirmed", "qr_code_data": _fast_uuid()}},
+        session=mongo_session
     )
+    return "confirmed"
+
+async def record_checkout_status(transaction: Dict[str, Any], status: Optional[str], payment_status: str) -> Optional[str]:
+    """Store a checkout outcome, confirming the booking once it is paid.
+    
+    Returns the booking status after a paid checkout, otherwise None.
+    """
+    transaction_update = {"$set": {
+        "payment_status": payment_status,
+        "status": status,
+        "updated_at": _utcnow_iso()
+    }}
+    paid = payment_status == "paid"
+    booking_status = None
+    
+    if mongo_supports_transactions:
+        # Confirmation, seat reservation and the transaction update commit together
+        async with await client.start_session() as mongo_session:
+            async with mongo_session.start_transaction():
+                if paid:
+                    booking_status = await confirm_paid_booking(transaction["booking_id"], mongo_session)
+                await db.payment_transactions.update_one(
+                    {"session_id": transaction["session_id"]}, transaction_update, session=mongo_session
+                )
+    else:
+        # Standalone server: apply the same steps in order. The transaction is
+        # marked paid last, so a retry after a failure redoes the confirmation.
+        if paid:
+            booking_status = await confirm_paid_booking(transaction["booking_id"])
+        await db.payment_transactions.update_one({"session_id": transaction["session_id"]}, transaction_update)
     
-    return {"url": session.url, "session_id": session.session_id}
+    return booking_status
 
 @api_router.get("/bookings/payment-status/{session_id}")
 async def check_payment_status(session_id: str, user: User = Depends(require_auth)):
@@ -570,48 +923,23 @@ async def check_payment_status(session_id: str, user: User = Depends(require_aut
     
     # Check if already processed
     if transaction["payment_status"] == "paid":
-        return {"status": "completed", "payment_status": "paid"}
-    
-    # Initialize Stripe and check status
-    stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url="")
-    checkout_status: CheckoutStatusResponse = await stripe_checkout.get_checkout_status(session_id)
-    
-    # Update transaction
-    await db.payment_transactions.update_one(
-        {"session_id": session_id},
-        {"$set": {
-            "payment_status": checkout_status.payment_status,
-            "status": checkout_status.status,
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }}
-    )
+        booking = await db.bookings.find_one({"id": transaction["booking_id"]}, {"_id": 0, "status": 1})
+        return {
+            "status": "completed",
+            "payment_status": "paid",
+            "booking_status": booking["status"] if booking else None
+        }
     
-    # If payment successful, update booking
-    if checkout_status.payment_status == "paid":
-        booking_id = transaction["booking_id"]
-        booking = await db.bookings.find_one({"id": booking_id}, {"_id": 0})
-        
-        if booking and booking["status"] == "pending":
-            # Generate QR code data
-            qr_code_data = str(uuid.uuid4())
-            
-            await db.bookings.update_one(
-                {"id": booking_id},
-                {"$set": {
-                    "status": "confirmed",
-                    "qr_code_data": qr_code_data
-                }}
-            )
-            
-            # Update ticket sold count
-            await db.ticket_types.update_one(
-                {"id": booking["ticket_type_id"]},
-                {"$inc": {"quantity_sold": booking["quantity"]}}
-            )
+    # Check status with Stripe
+    checkout_status = await get_stripe_client().checkout.sessions.retrieve_async(session_id)
+    booking_status = await record_checkout_status(
+        transaction, checkout_status.status, checkout_status.payment_status
+    )
     
     return {
         "status": checkout_status.status,
         "payment_status": checkout_status.payment_status,
+        "booking_status": booking_status,
         "amount_total": checkout_status.amount_total,
         "currency": checkout_status.currency
     }
@@ -619,50 +947,69 @@ async def check_payment_status(session_id: str, user: User = Depends(require_aut
 @api_router.post("/webhook/stripe")
 async def stripe_webhook(request: Request):
     """Handle Stripe webhooks"""
+    # Missing configuration is a server problem, not a bad request
+    stripe_checkout = get_stripe_client()
+    if not stripe_webhook_secret:
+        raise HTTPException(status_code=503, detail="Stripe webhooks not configured")
+    
     body = await request.body()
     signature = request.headers.get("Stripe-Signature")
     
-    stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url="")
-    
     try:
-        webhook_response = await stripe_checkout.handle_webhook(body, signature)
-        
-        # Update transaction based on webhook
-        if webhook_response.event_type == "checkout.session.completed":
-            await db.payment_transactions.update_one(
-                {"session_id": webhook_response.session_id},
-                {"$set": {
-                    "payment_status": webhook_response.payment_status,
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }}
-            )
-        
-        return {"success": True}
-    except Exception as e:
+        # Signature verification is local HMAC work, no Stripe round-trip
+        event = stripe_checkout.construct_event(body, signature, stripe_webhook_secret)
+    except (ValueError, stripe.SignatureVerificationError) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    # Update transaction based on webhook
+    if event.type == "checkout.session.completed":
+        checkout_session = event.data.object
+        transaction = await db.payment_transactions.find_one(
+            {"session_id": checkout_session.id}, {"_id": 0}
+        )
+        if transaction and transaction["payment_status"] != "paid":
+            await record_checkout_status(
+                transaction, checkout_session.status, checkout_session.payment_status
+            )
+    elif event.type == "checkout.session.expired":
+        # Only the booking's latest checkout session owns its hold
+        checkout_session = event.data.object
+        await release_booking_hold({"payment_intent_id": checkout_session.id})
+    
+    return {"success": True}
 
 @api_router.get("/bookings/my-bookings/list", response_model=List[BookingWithDetails])
-async def get_my_bookings(user: User = Depends(require_auth)):
+async def get_my_bookings(
+    user: User = Depends(require_auth),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0)
+):
     """Get user's bookings"""
-    bookings = await db.bookings.find({"user_id": user.id}, {"_id": 0}).to_list(1000)
-    
-    bookings_with_details = []
-    for booking in bookings:
-        event = await db.events.find_one({"id": booking["event_id"]}, {"_id": 0})
-        ticket_type = await db.ticket_types.find_one({"id": booking["ticket_type_id"]}, {"_id": 0})
-        
-        if event and ticket_type:
-            booking["event_title"] = event["title"]
-            booking["event_date"] = event["date"]
-            booking["event_location"] = event["location"]
-            booking["ticket_type_name"] = ticket_type["name"]
-            
-            if isinstance(booking.get('created_at'), str):
-                booking['created_at'] = datetime.fromisoformat(booking['created_at'])
-            
-            bookings_with_details.append(BookingWithDetails(**booking))
-    
-    return bookings_with_details
+    if limit is None:
+        limit = UNPAGED_LIMIT
+    # Join event and ticket type details in a single aggregation
+    bookings_with_details = await db.bookings.aggregate([
+        {"$match": {"user_id": user.id}},
+        {"$sort": LIST_SORT},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$lookup": {"from": "events", "localField": "event_id", "foreignField": "id", "as": "event"}},
+        {"$unwind": "$event"},
+        {"$lookup": {"from": "ticket_types", "localField": "ticket_type_id", "foreignField": "id", "as": "ticket_type"}},
+        {"$unwind": "$ticket_type"},
+        {"$addFields": {
+            "event_title": "$event.title",
+            "event_date": "$event.date",
+            "event_location": "$event.location",
+            "ticket_type_name": "$ticket_type.name"
+        }},
+        {"$project": {"_id": 0, "event": 0, "ticket_type": 0}}
+    ]).to_list(limit)
+    
+    return MsgspecJSONResponse(bookings_with_details)
+
+# Rendered QR PNGs keyed by qr_code_data
+qr_png_cache: LRUCache = LRUCache(maxsize=1024)
 
 @api_router.get("/bookings/{booking_id}/qr")
 async def get_booking_qr(booking_id: str, user: User = Depends(require_auth)):
@@ -677,19 +1024,20 @@ async def get_booking_qr(booking_id: str, user: User = Depends(require_auth)):
     if booking["status"] != "confirmed" or not booking.get("qr_code_data"):
         raise HTTPException(status_code=400, detail="Booking not confirmed or QR code not available")
     
-    # Generate QR code image
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(booking["qr_code_data"])
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to bytes
-    buf = BytesIO()
-    img.save(buf, format='PNG')
-    buf.seek(0)
-    
-    return StreamingResponse(buf, media_type="image/png")
+    # qr_code_data never changes once issued, so the PNG is rendered once
+    qr_code_data = booking["qr_code_data"]
+    png = qr_png_cache.get(qr_code_data)
+    if png is None:
+        buf = BytesIO()
+        segno.make_qr(qr_code_data, error="m").save(buf, kind="png", scale=10, border=5)
+        png = buf.getvalue()
+        qr_png_cache[qr_code_data] = png
+    
+    return Response(
+        content=png,
+        media_type="image/png",
+        headers={"Cache-Control": "private, max-age=31536000, immutable"}
+    )
 
 # ============ ADMIN ROUTES ============
 
@@ -729,21 +1077,21 @@ async def get_admin_stats(user: User = Depends(require_admin)):
 async def get_all_users(
     user: User = Depends(require_admin),
     role: Optional[str] = None,
-    limit: int = 100,
-    skip: int = 0
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0)
 ):
     """Get all users with optional role filter"""
     query = {}
     if role:
         query["role"] = role
     
-    users = await db.users.find(query, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
-    result = []
+    users = await db.users.find(
+        query, {"_id": 0, "id": 1, "email": 1, "name": 1, "picture": 1, "role": 1, "created_at": 1}
+    ).sort(list(LIST_SORT.items())).skip(skip).limit(limit).to_list(limit)
     for u in users:
         if isinstance(u.get('created_at'), datetime):
             u['created_at'] = u['created_at'].isoformat()
-        result.append(UserWithRole(**u))
-    return result
+    return MsgspecJSONResponse(users)
 
 @api_router.patch("/admin/users/{user_id}/role")
 async def update_user_role(
@@ -752,7 +1100,7 @@ async def update_user_role(
     admin: User = Depends(require_admin)
 ):
     """Update user role (admin only)"""
-    if role_data.role not in ["attendee", "organizer", "admin"]:
+    if role_data.role not in ROLES:
         raise HTTPException(status_code=400, detail="Invalid role")
     
     # Don't allow user to change their own role
@@ -767,6 +1115,7 @@ async def update_user_role(
         {"id": user_id},
         {"$set": {"role": role_data.role}}
     )
+    invalidate_user_sessions(user_id)
     
     return {"success": True, "user_id": user_id, "new_role": role_data.role}
 
@@ -774,60 +1123,69 @@ async def update_user_role(
 async def get_all_events_admin(
     user: User = Depends(require_admin),
     status: Optional[str] = None,
-    limit: int = 100,
-    skip: int = 0
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0)
 ):
     """Get all events for admin"""
     query = {}
     if status:
         query["status"] = status
     
-    events = await db.events.find(query, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+    events = await db.events.find(query, {"_id": 0}).sort(list(LIST_SORT.items())).skip(skip).limit(limit).to_list(limit)
+    
+    # Fetch all creators in one batched query
+    creator_ids = list({e["creator_id"] for e in events})
+    creators = await db.users.find(
+        {"id": {"$in": creator_ids}}, {"_id": 0, "id": 1, "name": 1, "email": 1}
+    ).to_list(None)
+    creators_by_id = {c["id"]: c for c in creators}
     
-    result = []
     for event in events:
-        creator = await db.users.find_one({"id": event["creator_id"]}, {"_id": 0})
-        event_with_creator = EventWithCreator(
-            **event,
-            creator_name=creator.get("name", "Unknown") if creator else "Unknown",
-            creator_email=creator.get("email", "") if creator else ""
-        )
-        result.append(event_with_creator)
+        creator = creators_by_id.get(event["creator_id"])
+        event["creator_name"] = creator.get("name", "Unknown") if creator else "Unknown"
+        event["creator_email"] = creator.get("email", "") if creator else ""
     
-    return result
+    return MsgspecJSONResponse(events)
 
 @api_router.get("/admin/bookings", response_model=List[BookingWithDetails])
 async def get_all_bookings_admin(
     user: User = Depends(require_admin),
     status: Optional[str] = None,
-    limit: int = 100,
-    skip: int = 0
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0)
 ):
     """Get all bookings for admin"""
     query = {}
     if status:
         query["status"] = status
     
-    bookings = await db.bookings.find(query, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+    bookings = await db.bookings.find(query, {"_id": 0}).sort(list(LIST_SORT.items())).skip(skip).limit(limit).to_list(limit)
+    
+    # Fetch related events and ticket types with two concurrent batched queries
+    event_ids = list({b["event_id"] for b in bookings})
+    ticket_type_ids = list({b["ticket_type_id"] for b in bookings})
+    events, ticket_types = await asyncio.gather(
+        db.events.find(
+            {"id": {"$in": event_ids}}, {"_id": 0, "id": 1, "title": 1, "date": 1, "location": 1}
+        ).to_list(None),
+        db.ticket_types.find({"id": {"$in": ticket_type_ids}}, {"_id": 0, "id": 1, "name": 1}).to_list(None)
+    )
+    events_by_id = {e["id"]: e for e in events}
+    ticket_types_by_id = {t["id"]: t for t in ticket_types}
     
-    result = []
     for booking in bookings:
-        event = await db.events.find_one({"id": booking["event_id"]}, {"_id": 0})
-        ticket_type = await db.ticket_types.find_one({"id": booking["ticket_type_id"]}, {"_id": 0})
+        event = events_by_id.get(booking["event_id"])
+        ticket_type = ticket_types_by_id.get(booking["ticket_type_id"])
         
         if isinstance(booking.get('created_at'), datetime):
             booking['created_at'] = booking['created_at'].isoformat()
         
-        booking_with_details = BookingWithDetails(
-            **booking,
-            event_title=event.get("title", "Unknown") if event else "Unknown",
-            event_date=event.get("date", "") if event else "",
-            event_location=event.get("location", "") if event else "",
-            ticket_type_name=ticket_type.get("name", "Unknown") if ticket_type else "Unknown"
-        )
-        result.append(booking_with_details)
+        booking["event_title"] = event.get("title", "Unknown") if event else "Unknown"
+        booking["event_date"] = event.get("date", "") if event else ""
+        booking["event_location"] = event.get("location", "") if event else ""
+        booking["ticket_type_name"] = ticket_type.get("name", "Unknown") if ticket_type else "Unknown"
     
-    return result
+    return MsgspecJSONResponse(bookings)
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -840,13 +1198,83 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: handlers only enqueue records, and a background listener
+# thread does the formatting and stream writes off the event loop. The queue
+# handler is attached only while the listener runs, so importing the module
+# without starting the app does not fill a queue nothing drains.
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_listener = QueueListener(log_queue, log_stream_handler, respect_handler_level=True)
+log_queue_handler = QueueHandler(log_queue)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+# httpx logs every outbound request (auth service, Stripe) at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Background task releasing lapsed seat holds, started with the app
+hold_sweeper: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_log_listener():
+    log_listener.start()
+    root_logger.addHandler(log_queue_handler)
+
+@app.on_event("startup")
+async def detect_transaction_support():
+    global mongo_supports_transactions
+    hello = await client.admin.command("hello")
+    mongo_supports_transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+    if not mongo_supports_transactions:
+        logger.warning("MongoDB is a standalone server; payment confirmation runs without transactions")
+
+@app.on_event("startup")
+async def start_hold_sweeper():
+    global hold_sweeper
+    hold_sweeper = asyncio.create_task(sweep_expired_holds())
+
+async def create_unique_index(collection, keys):
+    """Create a unique index, logging instead of aborting startup on duplicate data"""
+    try:
+        await collection.create_index(keys, unique=True)
+    except DuplicateKeyError as e:
+        # Existing duplicates must be removed by hand before the index can be built
+        logger.error("Unique index on %s.%s not created, remove the duplicates: %s", collection.name, keys, e)
+
+@app.on_event("startup")
+async def create_indexes():
+    """Create indexes for the query shapes used by the handlers"""
+    await create_unique_index(db.users, "id")
+    await create_unique_index(db.users, "email")
+    await db.users.create_index("role")
+    await create_unique_index(db.user_sessions, "session_token")
+    # TTL index: Mongo purges sessions once expires_at (a BSON date) has passed
+    await db.user_sessions.create_index("expires_at", expireAfterSeconds=0)
+    await create_unique_index(db.events, "id")
+    await db.events.create_index([("status", 1), ("category", 1)])
+    await db.events.create_index([("status", 1), ("created_at", 1), ("id", 1)])
+    await db.events.create_index([("creator_id", 1), ("created_at", 1), ("id", 1)])
+    await db.events.create_index([("title", "text"), ("description", "text")])
+    await create_unique_index(db.ticket_types, "id")
+    await db.ticket_types.create_index([("event_id", 1), ("id", 1)])
+    await create_unique_index(db.bookings, "id")
+    await db.bookings.create_index([("user_id", 1), ("created_at", 1), ("id", 1)])
+    # Serves the status filters and the expired-hold sweep
+    await db.bookings.create_index([("status", 1), ("hold_expires_at", 1)])
+    await db.bookings.create_index("payment_intent_id")
+    await create_unique_index(db.payment_transactions, "session_id")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if hold_sweeper:
+        hold_sweeper.cancel()
     client.close()
+    await auth_client.aclose()
+    if redis_client:
+        await redis_client.aclose()
+    if log_queue_handler in root_logger.handlers:
+        root_logger.removeHandler(log_queue_handler)
+        # Drains the queued records before the listener thread exits
+        log_listener.stop()
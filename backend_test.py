@@ -4,189 +4,304 @@ Event Management App Backend API Testing - Role System Focus
 Tests user role system, role-based access control, and admin endpoints
 """
 
-import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+import itertools
+import socket
 import sys
-import json
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+
+from _auth import BASE_URL, bearer_headers, mongo, new_session, test_db
+
+HTTP_METHODS = frozenset({'GET', 'POST', 'PUT', 'PATCH', 'DELETE'})
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets disable Nagle and keep idle connections alive"""
+
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+# Static fields of the event posted by the access-control tests
+EVENT_TEMPLATE = {
+    "description": "Testing role-based access control",
+    "location": "Test Venue, Test City",
+    "capacity": 100,
+    "category": "Conference",
+    "image_url": "https://via.placeholder.com/400x300"
+}
+
+# (label, role, is_first_user) for the role suite; the organizer starts as attendee
+ROLE_TEST_USERS = (
+    ("admin", "admin", True),
+    ("attendee", "attendee", False),
+    ("organizer", "attendee", False),
+)
 
 class EventAppRoleTester:
-    def __init__(self, base_url="https://ticketmaster-70.preview.emergentagent.com"):
+    # Unique suffixes for generated users and tokens, even when several are built in the same second
+    _id_counter = itertools.count(int(time.time()) * 1000)
+
+    def __init__(self, base_url=BASE_URL):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
-        self.admin_token = None
         self.admin_id = None
-        self.attendee_token = None
         self.attendee_id = None
-        self.organizer_token = None
         self.organizer_id = None
+        self._tokens = {}
         self.tests_run = 0
         self.tests_passed = 0
         self.test_results = []
+        self._headers_by_token = {}
+        # Test groups may run on worker threads: results and counters share a lock,
+        # and each thread buffers its own output so groups print as whole blocks
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = datetime.now().isoformat()
+        self._t0 = time.perf_counter()
+        
+        # One pooled session so every call reuses the same TCP/TLS connection;
+        # idempotent calls are retried on gateway errors instead of failing the test
+        self.session = new_session()
+        self.session.headers['Connection'] = 'keep-alive'
+        retry = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504],
+                      allowed_methods=['GET', 'PUT', 'DELETE'])
+        adapter = KeepAliveAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name}")
-        else:
-            print(f"❌ {name} - {details}")
-        
-        self.test_results.append({
-            "test": name,
-            "success": success,
-            "details": details,
-            "timestamp": datetime.now().isoformat()
-        })
+        self._log_buf.append(f"✅ {name}" if success else f"❌ {name} - {details}")
+        
+        with self._lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+            self.test_results.append({
+                "test": name,
+                "success": success,
+                "details": details,
+                "t_ms": round((time.perf_counter() - self._t0) * 1000, 1)  # offset from started_at
+            })
+
+    @property
+    def _log_buf(self) -> list:
+        """Output lines buffered by the current thread's test group"""
+        if not hasattr(self._local, 'lines'):
+            self._local.lines = []
+        return self._local.lines
+
+    def log_section(self, title: str):
+        """Open a test group's output block"""
+        self._log_buf.append(f"\n{title}")
+
+    def flush_log(self):
+        """Write the buffered lines for this thread's last test group in one go"""
+        with self._lock:
+            if self._log_buf:
+                sys.stdout.write('\n'.join(self._log_buf) + '\n')
+                self._log_buf.clear()
+            sys.stdout.flush()
+
+    def run_group(self, test, *args):
+        """Run one test group and flush its output as a single block"""
+        try:
+            return test(*args)
+        finally:
+            self.flush_log()
+
+    def _summarize(self, success: bool, data: Any, kind: str = "items") -> str:
+        """Short log detail: a count for list responses, a truncated repr otherwise"""
+        if success and isinstance(data, list):
+            return f"Found {len(data)} {kind}"
+        return repr(data)[:200]
 
-    def make_request(self, method: str, endpoint: str, data: Dict = None, 
-                    expected_status: int = 200, use_auth: bool = False, token: str = None) -> tuple[bool, Dict]:
-        """Make HTTP request and validate response"""
+    def make_request(self, method: str, endpoint: str, data: Union[Dict, bytes] = None, 
+                    expected_status: int = 200, use_auth: bool = False, token: str = None,
+                    parse_body: bool = True) -> tuple[bool, Dict]:
+        """Make HTTP request and validate response; status-only checks can skip parsing the body"""
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if use_auth:
-            auth_token = token or self.admin_token  # Default to admin token
-            if auth_token:
-                headers['Authorization'] = f'Bearer {auth_token}'
+        # Content-Type lives on the session; auth headers are built once per token
+        headers = self._headers_by_token.get(token or self.admin_token) if use_auth else None  # Default to admin token
+
+        if method not in HTTP_METHODS:
+            return False, {"error": f"Unsupported method: {method}"}
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=30)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=30)
-            elif method == 'PATCH':
-                response = requests.patch(url, json=data, headers=headers, timeout=30)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            # Bodies may arrive pre-encoded when the same payload is sent repeatedly
+            body = data if data is None or isinstance(data, bytes) else orjson.dumps(data)
+            response = self.session.request(method, url, data=body, headers=headers, timeout=30)
 
             success = response.status_code == expected_status
+            if not parse_body:
+                return success, {}
+            
             try:
-                response_data = response.json()
-            except:
-                response_data = {"status_code": response.status_code, "text": response.text[:200]}
+                response_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                # Only decode the slice we keep, not the whole body
+                response_data = {"status_code": response.status_code,
+                                 "text": response.content[:200].decode(errors='replace')}
 
             return success, response_data
 
         except Exception as e:
             return False, {"error": str(e)}
 
+    def make_concurrent_requests(self, calls: list) -> list:
+        """Issue independent requests in parallel; results come back in call order"""
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(self.make_request, *args, **kwargs) for args, kwargs in calls]
+            return [future.result() for future in futures]
+
     def clear_database(self) -> bool:
         """Clear database to test first-user-as-admin logic"""
         print("\n🗑️ Clearing database for role testing...")
         
         try:
-            import subprocess
-            
             # Clear all collections
-            clear_cmd = """mongosh test_database --eval "db.users.deleteMany({}); db.user_sessions.deleteMany({}); db.events.deleteMany({}); db.bookings.deleteMany({}); db.ticket_types.deleteMany({});" """
-            
-            result = subprocess.run(clear_cmd, shell=True, capture_output=True, text=True, timeout=30)
+            db = test_db
+            for collection in ('users', 'user_sessions', 'events', 'bookings', 'ticket_types'):
+                db[collection].delete_many({})
             
-            if result.returncode == 0:
-                print("✅ Database cleared successfully")
-                return True
-            else:
-                print(f"❌ Database clear failed: {result.stderr}")
-                return False
+            print("✅ Database cleared successfully")
+            return True
                 
         except Exception as e:
             print(f"❌ Database clear error: {str(e)}")
             return False
 
-    def create_test_user(self, role: str, is_first_user: bool = False) -> tuple[str, str]:
-        """Create test user with specific role"""
-        timestamp = int(time.time())
-        user_id = f"test-{role}-{timestamp}"
-        session_token = f"session_{role}_{timestamp}"
-        email = f"test.{role}.{timestamp}@example.com"
+    def _build_test_user(self, label: str, role: str, is_first_user: bool = False) -> tuple[Dict, Dict]:
+        """Build the user and session documents for one test user"""
+        seq = next(self._id_counter)
+        user_id = f"test-{label}-{seq}"
+        session_token = f"session_{label}_{seq}"
+        email = f"test.{label}.{seq}@example.com"
         
         # First user should automatically become admin regardless of specified role
         actual_role = "admin" if is_first_user else role
         
-        # Create datetime strings in ISO format as expected by the backend
         now = datetime.now(timezone.utc)
         expires_at = now + timedelta(days=7)
         
-        # Use direct mongosh command execution
+        user_doc = {
+            "id": user_id,
+            "email": email,
+            "name": f"Test {label.title()} User",
+            "picture": "https://via.placeholder.com/150",
+            "role": actual_role,
+            "created_at": now.isoformat()
+        }
+        session_doc = {
+            "user_id": user_id,
+            "session_token": session_token,
+            "expires_at": expires_at,
+            "created_at": now.isoformat()
+        }
+        return user_doc, session_doc
+
+    def create_test_users(self, specs) -> Optional[list]:
+        """Create several (label, role, is_first_user) test users with one insert per collection"""
+        docs = [self._build_test_user(*spec) for spec in specs]
+        
+        # One insert_many per collection covers every requested user
         try:
-            import subprocess
-            
-            # Create user
-            user_cmd = f"""mongosh test_database --eval "db.users.insertOne({{id: '{user_id}', email: '{email}', name: 'Test {role.title()} User', picture: 'https://via.placeholder.com/150', role: '{actual_role}', created_at: '{now.isoformat()}'}})" """
-            
-            user_result = subprocess.run(user_cmd, shell=True, capture_output=True, text=True, timeout=30)
-            
-            if user_result.returncode != 0:
-                print(f"❌ {role.title()} user creation failed: {user_result.stderr}")
-                return None, None
-            
-            # Create session
-            session_cmd = f"""mongosh test_database --eval "db.user_sessions.insertOne({{user_id: '{user_id}', session_token: '{session_token}', expires_at: '{expires_at.isoformat()}', created_at: '{now.isoformat()}'}})" """
-            
-            session_result = subprocess.run(session_cmd, shell=True, capture_output=True, text=True, timeout=30)
-            
-            if session_result.returncode != 0:
-                print(f"❌ {role.title()} session creation failed: {session_result.stderr}")
-                return None, None
-            
-            print(f"✅ {role.title()} user created: {email} (actual role: {actual_role})")
-            return user_id, session_token
-                
+            db = test_db
+            db.users.insert_many([user_doc for user_doc, _ in docs], ordered=False)
+            db.user_sessions.insert_many([session_doc for _, session_doc in docs], ordered=False)
+        except BulkWriteError as e:
+            print(f"❌ Test user creation failed: {e.details}")
+            return None
         except Exception as e:
-            print(f"❌ {role.title()} user creation error: {str(e)}")
-            return None, None
+            print(f"❌ Test user creation error: {str(e)}")
+            return None
+        
+        for (label, _, _), (user_doc, _) in zip(specs, docs):
+            print(f"✅ {label.title()} user created: {user_doc['email']} (actual role: {user_doc['role']})")
+        return [(user_doc["id"], session_doc["session_token"]) for user_doc, session_doc in docs]
+
+    def create_test_user(self, role: str, is_first_user: bool = False, label: str = None) -> tuple[str, str]:
+        """Create test user with specific role"""
+        created = self.create_test_users([(label or role, role, is_first_user)])
+        return created[0] if created else (None, None)
 
     def setup_role_test_users(self) -> bool:
         """Setup test users for role testing"""
         print("\n🔧 Setting up role test users...")
         
-        # Create admin user (first user)
-        self.admin_id, self.admin_token = self.create_test_user("admin", is_first_user=True)
-        if not self.admin_token:
-            return False
-        
-        # Create attendee user
-        self.attendee_id, self.attendee_token = self.create_test_user("attendee")
-        if not self.attendee_token:
+        # Fail fast if MongoDB is down instead of timing out on the first insert
+        try:
+            mongo.admin.command('ping')
+        except ServerSelectionTimeoutError as e:
+            print(f"❌ MongoDB not reachable: {str(e)}")
             return False
         
-        # Create organizer user (will start as attendee, then we'll change role)
-        self.organizer_id, self.organizer_token = self.create_test_user("attendee")
-        if not self.organizer_token:
+        # Seed all three users in one round trip; the token properties then find them cached
+        created = self.create_test_users(ROLE_TEST_USERS)
+        if not created:
             return False
         
+        for (key, _, _), (user_id, token) in zip(ROLE_TEST_USERS, created):
+            self._remember_user(key, user_id, token)
         return True
 
-    def test_health_check(self):
-        """Test basic connectivity"""
-        print("\n🏥 Testing Health Check...")
-        try:
-            response = requests.get(f"{self.base_url}/", timeout=10)
-            success = response.status_code in [200, 404]  # 404 is OK for root
-            self.log_test("Health Check", success, f"Status: {response.status_code}")
-        except Exception as e:
-            self.log_test("Health Check", False, str(e))
+    def _remember_user(self, key: str, user_id: Optional[str], token: Optional[str]):
+        """Record a created test user's id, token and auth header"""
+        setattr(self, f"{key}_id", user_id)
+        self._tokens[key] = token
+        if token:
+            self._headers_by_token[token] = bearer_headers(token)
+
+    def _ensure_user(self, key: str, role: str, is_first_user: bool = False) -> Optional[str]:
+        """Create the test user for `key` on first use and return its session token"""
+        if key not in self._tokens:
+            self._remember_user(key, *self.create_test_user(role, is_first_user=is_first_user, label=key))
+        return self._tokens[key]
+
+    @property
+    def admin_token(self) -> Optional[str]:
+        # Admin user (first user)
+        return self._ensure_user("admin", "admin", is_first_user=True)
+
+    @property
+    def attendee_token(self) -> Optional[str]:
+        return self._ensure_user("attendee", "attendee")
+
+    @property
+    def organizer_token(self) -> Optional[str]:
+        # Organizer user (will start as attendee, then we'll change role)
+        return self._ensure_user("organizer", "attendee")
 
     def test_user_role_assignment(self):
         """Test user role assignment and first-user-as-admin logic"""
-        print("\n👑 Testing User Role Assignment...")
+        self.log_section("👑 Testing User Role Assignment...")
+        
+        admin_me, attendee_me = self.make_concurrent_requests([
+            (('GET', 'auth/me'), {'use_auth': True, 'token': self.admin_token}),
+            (('GET', 'auth/me'), {'use_auth': True, 'token': self.attendee_token}),
+        ])
         
         # Test admin user (first user should be admin)
-        success, data = self.make_request('GET', 'auth/me', use_auth=True, token=self.admin_token)
+        success, data = admin_me
         if success and data.get('role') == 'admin':
             self.log_test("First user gets admin role", True, f"Role: {data.get('role')}")
         else:
             self.log_test("First user gets admin role", False, f"Expected admin, got: {data.get('role', 'unknown')}")
         
         # Test attendee user (default role)
-        success, data = self.make_request('GET', 'auth/me', use_auth=True, token=self.attendee_token)
+        success, data = attendee_me
         if success and data.get('role') == 'attendee':
             self.log_test("Second user gets attendee role", True, f"Role: {data.get('role')}")
         else:
@@ -206,26 +321,39 @@ class EventAppRoleTester:
             else:
                 self.log_test("Role change verification", False, f"Expected organizer, got: {data.get('role', 'unknown')}")
         else:
-            self.log_test("PATCH /auth/select-role (attendee to organizer)", False, str(data))
+            self.log_test("PATCH /auth/select-role (attendee to organizer)", False, self._summarize(success, data))
         
         # Test invalid role selection
         invalid_role_data = {"role": "invalid_role"}
         success, data = self.make_request('PATCH', 'auth/select-role', invalid_role_data, 
-                                        expected_status=400, use_auth=True, token=self.attendee_token)
+                                        expected_status=400, use_auth=True, token=self.attendee_token, parse_body=False)
         self.log_test("PATCH /auth/select-role (invalid role)", success, "Correctly rejected invalid role")
         
         # Test admin cannot change their role
         admin_role_data = {"role": "attendee"}
         success, data = self.make_request('PATCH', 'auth/select-role', admin_role_data, 
-                                        expected_status=403, use_auth=True, token=self.admin_token)
+                                        expected_status=403, use_auth=True, token=self.admin_token, parse_body=False)
         self.log_test("PATCH /auth/select-role (admin cannot change)", success, "Admin role change correctly blocked")
 
     def test_admin_endpoints(self):
         """Test admin-only endpoints"""
-        print("\n👨‍💼 Testing Admin Endpoints...")
+        self.log_section("👨‍💼 Testing Admin Endpoints...")
+        
+        # These reads don't depend on each other or on the role update below
+        (stats_admin, stats_attendee, stats_organizer, users_attendee,
+         events_admin, events_organizer, bookings_admin, bookings_attendee) = self.make_concurrent_requests([
+            (('GET', 'admin/stats'), {'use_auth': True, 'token': self.admin_token}),
+            (('GET', 'admin/stats'), {'expected_status': 403, 'use_auth': True, 'token': self.attendee_token, 'parse_body': False}),
+            (('GET', 'admin/stats'), {'expected_status': 403, 'use_auth': True, 'token': self.organizer_token, 'parse_body': False}),
+            (('GET', 'admin/users'), {'expected_status': 403, 'use_auth': True, 'token': self.attendee_token, 'parse_body': False}),
+            (('GET', 'admin/events'), {'use_auth': True, 'token': self.admin_token}),
+            (('GET', 'admin/events'), {'expected_status': 403, 'use_auth': True, 'token': self.organizer_token, 'parse_body': False}),
+            (('GET', 'admin/bookings'), {'use_auth': True, 'token': self.admin_token}),
+            (('GET', 'admin/bookings'), {'expected_status': 403, 'use_auth': True, 'token': self.attendee_token, 'parse_body': False}),
+        ])
         
         # Test admin stats endpoint
-        success, data = self.make_request('GET', 'admin/stats', use_auth=True, token=self.admin_token)
+        success, data = stats_admin
         if success and isinstance(data, dict):
             stats = data
             expected_keys = ['total_users', 'total_events', 'total_bookings', 'total_revenue', 'role_distribution']
@@ -233,23 +361,21 @@ class EventAppRoleTester:
             self.log_test("GET /admin/stats (admin)", has_all_keys, 
                          f"Stats: {stats.get('total_users', 0)} users, {stats.get('total_events', 0)} events")
         else:
-            self.log_test("GET /admin/stats (admin)", False, str(data))
+            self.log_test("GET /admin/stats (admin)", False, self._summarize(success, data))
         
         # Test non-admin cannot access stats
-        success, data = self.make_request('GET', 'admin/stats', expected_status=403, 
-                                        use_auth=True, token=self.attendee_token)
+        success, data = stats_attendee
         self.log_test("GET /admin/stats (attendee - should fail)", success, 
                      "Correctly blocked non-admin from stats")
         
-        success, data = self.make_request('GET', 'admin/stats', expected_status=403, 
-                                        use_auth=True, token=self.organizer_token)
+        success, data = stats_organizer
         self.log_test("GET /admin/stats (organizer - should fail)", success, 
                      "Correctly blocked non-admin from stats")
         
         # Test admin users endpoint
         success, data = self.make_request('GET', 'admin/users', use_auth=True, token=self.admin_token)
         if success and isinstance(data, list):
-            self.log_test("GET /admin/users (admin)", True, f"Found {len(data)} users")
+            self.log_test("GET /admin/users (admin)", True, self._summarize(success, data, "users"))
             
             # Test role update
             if len(data) > 1:
@@ -266,128 +392,112 @@ class EventAppRoleTester:
                     # Test non-admin cannot update roles
                     success, update_data = self.make_request('PATCH', f'admin/users/{target_user["id"]}/role', 
                                                            role_update, expected_status=403, 
-                                                           use_auth=True, token=self.attendee_token)
+                                                           use_auth=True, token=self.attendee_token, parse_body=False)
                     self.log_test("PATCH /admin/users/{id}/role (attendee - should fail)", success, 
                                  "Correctly blocked non-admin from role updates")
         else:
-            self.log_test("GET /admin/users (admin)", False, str(data))
+            self.log_test("GET /admin/users (admin)", False, self._summarize(success, data))
         
         # Test non-admin cannot access users
-        success, data = self.make_request('GET', 'admin/users', expected_status=403, 
-                                        use_auth=True, token=self.attendee_token)
+        success, data = users_attendee
         self.log_test("GET /admin/users (attendee - should fail)", success, 
                      "Correctly blocked non-admin from users list")
         
         # Test admin events endpoint
-        success, data = self.make_request('GET', 'admin/events', use_auth=True, token=self.admin_token)
-        if success and isinstance(data, list):
-            self.log_test("GET /admin/events (admin)", True, f"Found {len(data)} events")
-        else:
-            self.log_test("GET /admin/events (admin)", False, str(data))
+        success, data = events_admin
+        self.log_test("GET /admin/events (admin)", success and isinstance(data, list),
+                     self._summarize(success, data, "events"))
         
         # Test non-admin cannot access admin events
-        success, data = self.make_request('GET', 'admin/events', expected_status=403, 
-                                        use_auth=True, token=self.organizer_token)
+        success, data = events_organizer
         self.log_test("GET /admin/events (organizer - should fail)", success, 
                      "Correctly blocked non-admin from admin events")
         
         # Test admin bookings endpoint
-        success, data = self.make_request('GET', 'admin/bookings', use_auth=True, token=self.admin_token)
-        if success and isinstance(data, list):
-            self.log_test("GET /admin/bookings (admin)", True, f"Found {len(data)} bookings")
-        else:
-            self.log_test("GET /admin/bookings (admin)", False, str(data))
+        success, data = bookings_admin
+        self.log_test("GET /admin/bookings (admin)", success and isinstance(data, list),
+                     self._summarize(success, data, "bookings"))
         
         # Test non-admin cannot access admin bookings
-        success, data = self.make_request('GET', 'admin/bookings', expected_status=403, 
-                                        use_auth=True, token=self.attendee_token)
+        success, data = bookings_attendee
         self.log_test("GET /admin/bookings (attendee - should fail)", success, 
                      "Correctly blocked non-admin from admin bookings")
 
     def test_role_based_access_control(self):
         """Test role-based access control for event creation"""
-        print("\n🔒 Testing Role-Based Access Control...")
+        self.log_section("🔒 Testing Role-Based Access Control...")
         
-        # Test event data
-        event_data = {
+        # Test event data, encoded once and reused by every POST below
+        event_data = orjson.dumps({
+            **EVENT_TEMPLATE,
             "title": f"Role Test Event {int(time.time())}",
-            "description": "Testing role-based access control",
-            "date": (datetime.now() + timedelta(days=30)).isoformat(),
-            "location": "Test Venue, Test City",
-            "capacity": 100,
-            "category": "Conference",
-            "image_url": "https://via.placeholder.com/400x300"
-        }
+            "date": (datetime.now() + timedelta(days=30)).isoformat()
+        })
+        
+        # The three creation attempts are independent, so they go out together
+        attendee_post, *allowed_posts = self.make_concurrent_requests([
+            (('POST', 'events', event_data), {'expected_status': 403, 'use_auth': True, 'token': self.attendee_token, 'parse_body': False}),
+            (('POST', 'events', event_data), {'expected_status': 200, 'use_auth': True, 'token': self.organizer_token}),
+            (('POST', 'events', event_data), {'expected_status': 200, 'use_auth': True, 'token': self.admin_token}),
+        ])
         
         # Test attendee CANNOT create events (should get 403)
-        success, data = self.make_request('POST', 'events', event_data, 
-                                        expected_status=403, use_auth=True, token=self.attendee_token)
+        success, data = attendee_post
         self.log_test("POST /events (attendee - should fail)", success, 
                      "Correctly blocked attendee from creating event")
         
-        # Test organizer CAN create events
-        success, data = self.make_request('POST', 'events', event_data, 
-                                        expected_status=200, use_auth=True, token=self.organizer_token)
-        if success:
-            organizer_event_id = data.get('id')
-            self.log_test("POST /events (organizer - should succeed)", True, 
-                         f"Organizer created event: {organizer_event_id}")
-        else:
-            self.log_test("POST /events (organizer - should succeed)", False, str(data))
-            organizer_event_id = None
-        
-        # Test admin CAN create events
-        success, data = self.make_request('POST', 'events', event_data, 
-                                        expected_status=200, use_auth=True, token=self.admin_token)
-        if success:
-            admin_event_id = data.get('id')
-            self.log_test("POST /events (admin - should succeed)", True, 
-                         f"Admin created event: {admin_event_id}")
-        else:
-            self.log_test("POST /events (admin - should succeed)", False, str(data))
-            admin_event_id = None
+        # Test organizer and admin CAN create events
+        created_event_ids = {}
+        for role, (success, data) in zip(("organizer", "admin"), allowed_posts):
+            test_name = f"POST /events ({role} - should succeed)"
+            if success:
+                created_event_ids[role] = data.get('id')
+                self.log_test(test_name, True, f"{role.title()} created event: {created_event_ids[role]}")
+            else:
+                created_event_ids[role] = None
+                self.log_test(test_name, False, self._summarize(success, data))
         
-        return organizer_event_id, admin_event_id
+        return created_event_ids["organizer"], created_event_ids["admin"]
     
     def test_event_ownership_control(self, organizer_event_id: str, admin_event_id: str):
         """Test that organizers can only edit their own events, but admins can edit any"""
-        print("\n🏠 Testing Event Ownership Control...")
+        self.log_section("🏠 Testing Event Ownership Control...")
         
-        if not organizer_event_id or not admin_event_id:
-            print("⚠️ Skipping ownership tests - missing event IDs")
-            return
+        update_data = orjson.dumps({"title": "Updated Event Title"})
         
-        update_data = {"title": "Updated Event Title"}
+        # All four edits write the same title, so they can run concurrently
+        (organizer_own, organizer_other, admin_other, admin_own) = self.make_concurrent_requests([
+            (('PUT', f'events/{organizer_event_id}', update_data), {'expected_status': 200, 'use_auth': True, 'token': self.organizer_token}),
+            (('PUT', f'events/{admin_event_id}', update_data), {'expected_status': 403, 'use_auth': True, 'token': self.organizer_token, 'parse_body': False}),
+            (('PUT', f'events/{organizer_event_id}', update_data), {'expected_status': 200, 'use_auth': True, 'token': self.admin_token}),
+            (('PUT', f'events/{admin_event_id}', update_data), {'expected_status': 200, 'use_auth': True, 'token': self.admin_token}),
+        ])
         
         # Test organizer can edit their own event
-        success, data = self.make_request('PUT', f'events/{organizer_event_id}', update_data,
-                                        expected_status=200, use_auth=True, token=self.organizer_token)
+        success, data = organizer_own
         self.log_test("PUT /events/{id} (organizer owns event)", success, 
                      "Organizer can edit own event")
         
         # Test organizer CANNOT edit admin's event
-        success, data = self.make_request('PUT', f'events/{admin_event_id}', update_data,
-                                        expected_status=403, use_auth=True, token=self.organizer_token)
+        success, data = organizer_other
         self.log_test("PUT /events/{id} (organizer doesn't own)", success, 
                      "Organizer correctly blocked from editing others' events")
         
         # Test admin CAN edit any event (including organizer's)
-        success, data = self.make_request('PUT', f'events/{organizer_event_id}', update_data,
-                                        expected_status=200, use_auth=True, token=self.admin_token)
+        success, data = admin_other
         self.log_test("PUT /events/{id} (admin can edit any)", success, 
                      "Admin can edit any event")
         
         # Test admin can edit their own event
-        success, data = self.make_request('PUT', f'events/{admin_event_id}', update_data,
-                                        expected_status=200, use_auth=True, token=self.admin_token)
+        success, data = admin_own
         self.log_test("PUT /events/{id} (admin owns event)", success, 
                      "Admin can edit own event")
 
-    def test_health_check(self):
-        """Test basic connectivity"""
-        print("\n🏥 Testing Health Check...")
+    def test_health_check(self, pending: Future = None):
+        """Test basic connectivity, optionally from a probe already in flight"""
+        self.log_section("🏥 Testing Health Check...")
         try:
-            response = requests.get(f"{self.base_url}/", timeout=10)
+            response = pending.result() if pending else self.session.get(f"{self.base_url}/", timeout=10)
             success = response.status_code in [200, 404]  # 404 is OK for root
             self.log_test("Health Check", success, f"Status: {response.status_code}")
         except Exception as e:
@@ -397,22 +507,35 @@ class EventAppRoleTester:
         """Run role system focused test suite"""
         print("🚀 Starting Event Management App Role System Tests")
         print(f"🌐 Testing API: {self.api_url}")
-        
-        # Setup - Clear database and create test users
-        if not self.clear_database():
-            print("❌ Cannot proceed without database clear")
-            return False
+        self.started_at = datetime.now().isoformat()
+        self._t0 = time.perf_counter()
+        
+        # Dependency order: setup -> role selection -> access control -> {ownership, admin}.
+        # The health probe needs nothing, and the last two groups touch different
+        # users and events, so those run alongside the main chain
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            health_probe = executor.submit(self.session.get, f"{self.base_url}/", timeout=10)
             
-        if not self.setup_role_test_users():
-            print("❌ Cannot proceed without test user setup")
-            return False
-        
-        # Run role-focused tests
-        self.test_health_check()
-        self.test_user_role_assignment()
-        organizer_event_id, admin_event_id = self.test_role_based_access_control()
-        self.test_event_ownership_control(organizer_event_id, admin_event_id)
-        self.test_admin_endpoints()
+            # Setup - Clear database and create test users
+            if not self.clear_database():
+                print("❌ Cannot proceed without database clear")
+                return False
+                
+            if not self.setup_role_test_users():
+                print("❌ Cannot proceed without test user setup")
+                return False
+            
+            # Run role-focused tests
+            self.run_group(self.test_health_check, health_probe)
+            self.run_group(self.test_user_role_assignment)
+            organizer_event_id, admin_event_id = self.run_group(self.test_role_based_access_control)
+            
+            admin_group = executor.submit(self.run_group, self.test_admin_endpoints)
+            if organizer_event_id and admin_event_id:
+                self.run_group(self.test_event_ownership_control, organizer_event_id, admin_event_id)
+            else:
+                print("\n⚠️ Skipping ownership tests - missing event IDs")
+            admin_group.result()
         
         # Summary
         print(f"\n📊 Role System Test Results: {self.tests_passed}/{self.tests_run} passed")
@@ -423,12 +546,16 @@ class EventAppRoleTester:
 
 def main():
     tester = EventAppRoleTester()
-    success = tester.run_role_system_tests()
+    try:
+        success = tester.run_role_system_tests()
+    finally:
+        tester.session.close()
     
     # Save detailed results
     results = {
         "timestamp": datetime.now().isoformat(),
         "test_type": "role_system_tests",
+        "started_at": tester.started_at,
         "summary": {
             "total_tests": tester.tests_run,
             "passed_tests": tester.tests_passed,
@@ -437,8 +564,10 @@ def main():
         "test_details": tester.test_results
     }
     
-    with open('/app/role_system_test_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    # Serialize once to bytes and write in a single call
+    payload = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    with open('/app/role_system_test_results.json', 'wb') as f:
+        f.write(payload)
     
     return 0 if success else 1
 
@@ -1,44 +1,51 @@
 #!/usr/bin/env python3
 """
 Debug authentication flow
+
+Probes /api/auth/me with a session token taken from the command line or
+DEBUG_AUTH_TOKEN. Pass --seed to probe with the cached admin token instead,
+seeding a new admin only if the cached one is missing or rejected.
 """
 
-import requests
-import json
-from datetime import datetime, timezone, timedelta
-
-def test_auth_debug():
-    base_url = "https://ticketmaster-70.preview.emergentagent.com"
-    api_url = f"{base_url}/api"
-    
-    # Test with the manual token we created
-    token = "session_admin_manual"
-    
-    print(f"Testing authentication with token: {token}")
-    
-    # Test auth/me endpoint
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
-    
+import argparse
+import os
+
+from _auth import BASE_URL, bearer_headers, get_or_create_admin_session, new_session
+
+def test_auth_debug(token=None, seed=False):
+    api_url = f"{BASE_URL}/api"
+
     try:
-        response = requests.get(f"{api_url}/auth/me", headers=headers, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.text}")
-        
-        if response.status_code != 200:
-            # Let's also test without Bearer prefix
-            headers2 = {
-                'Authorization': token,
-                'Content-Type': 'application/json'
-            }
-            response2 = requests.get(f"{api_url}/auth/me", headers=headers2, timeout=30)
-            print(f"Without Bearer - Status Code: {response2.status_code}")
-            print(f"Without Bearer - Response: {response2.text}")
-            
+        # Both probes share one keep-alive session
+        if seed:
+            session, token = get_or_create_admin_session(BASE_URL)
+        else:
+            session = new_session()
+        print(f"Testing authentication with token: {token}")
+
+        # Test auth/me endpoint
+        with session:
+            response = session.get(f"{api_url}/auth/me", headers=bearer_headers(token), timeout=30)
+            print(f"Status Code: {response.status_code}")
+            print(f"Response: {response.text}")
+
+            if response.status_code != 200:
+                # Let's also test without Bearer prefix
+                headers2 = {'Authorization': token}
+                response2 = session.get(f"{api_url}/auth/me", headers=headers2, timeout=30)
+                print(f"Without Bearer - Status Code: {response2.status_code}")
+                print(f"Without Bearer - Response: {response2.text}")
+
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    test_auth_debug()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Probe /api/auth/me with a session token")
+    parser.add_argument("token", nargs="?", default=os.environ.get("DEBUG_AUTH_TOKEN"),
+                        help="session token to probe (default: $DEBUG_AUTH_TOKEN)")
+    parser.add_argument("--seed", action="store_true",
+                        help="use the cached admin token, seeding an admin user if needed")
+    args = parser.parse_args()
+    if not args.token and not args.seed:
+        parser.error("pass a token, set DEBUG_AUTH_TOKEN, or use --seed")
+    test_auth_debug(args.token, args.seed)
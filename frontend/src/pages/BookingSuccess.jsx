@@ -12,7 +12,7 @@ const API = `${BACKEND_URL}/api`;
 const BookingSuccess = () => {
   const [searchParams] = useSearchParams();
   const navigate = useNavigate();
-  const [status, setStatus] = useState('checking'); // checking, success, failed
+  const [status, setStatus] = useState('checking'); // checking, success, refund, failed
   const [attempts, setAttempts] = useState(0);
   const sessionId = searchParams.get('session_id');
 
@@ -36,7 +36,10 @@ const BookingSuccess = () => {
         withCredentials: true
       });
 
-      if (response.data.payment_status === 'paid') {
+      if (response.data.booking_status === 'refund_required') {
+        setStatus('refund');
+        toast.error('Tickets sold out before your payment was confirmed');
+      } else if (response.data.payment_status === 'paid') {
         setStatus('success');
         toast.success('Payment successful!');
       } else if (response.data.status === 'expired') {
@@ -89,6 +92,20 @@ const BookingSuccess = () => {
           </>
         )}
 
+        {status === 'refund' && (
+          <>
+            <XCircle className="w-16 h-16 text-red-600 mx-auto mb-4" />
+            <h2 className="text-2xl font-bold text-gray-900 mb-2">Tickets Sold Out</h2>
+            <p className="text-gray-600 mb-6">Your payment went through, but the tickets sold out before it was confirmed. Your payment will be refunded.</p>
+            <Button
+              onClick={() => navigate('/my-bookings')}
+              className="w-full bg-blue-600 hover:bg-blue-700 text-white rounded-full"
+            >
+              View My Bookings
+            </Button>
+          </>
+        )}
+
         {status === 'failed' && (
           <>
             <XCircle className="w-16 h-16 text-red-600 mx-auto mb-4" />
@@ -3,10 +3,13 @@
 Test datetime format compatibility
 """
 
+import time
 from datetime import datetime, timezone, timedelta
 
-# Test the exact format the backend uses
-now = datetime.now(timezone.utc)
+UTC = timezone.utc
+
+# Test the exact format the backend uses; one clock read serves every comparison below
+now = datetime.now(UTC)
 expires_at = now + timedelta(days=7)
 
 # Convert to ISO format like the backend does
@@ -22,15 +25,16 @@ print(f"Expires at ISO: {expires_at_iso}")
 try:
     parsed_expires = datetime.fromisoformat(expires_at_iso)
     print(f"Parsed expires: {parsed_expires}")
-    print(f"Is future: {parsed_expires > datetime.now(timezone.utc)}")
+    print(f"Is future: {parsed_expires > now}")
 except Exception as e:
     print(f"Error parsing: {e}")
 
 # Test with the format we stored in DB
 test_format = "2025-11-24T14:56:33.964183+00:00"
 try:
-    parsed_test = datetime.fromisoformat(test_format)
-    print(f"Parsed test format: {parsed_test}")
-    print(f"Test is future: {parsed_test > datetime.now(timezone.utc)}")
+    # Compare epoch seconds: a float compare instead of an aware-datetime compare
+    expires_epoch = datetime.fromisoformat(test_format).timestamp()
+    print(f"Parsed test format: {expires_epoch}")
+    print(f"Test is future: {expires_epoch > time.time()}")
 except Exception as e:
     print(f"Error parsing test format: {e}")
\ No newline at end of file
@@ -11,7 +11,7 @@ import os
 async def test_db_queries():
     # Connect to MongoDB like the backend does
     mongo_url = "mongodb://localhost:27017"
-    client = AsyncIOMotorClient(mongo_url)
+    client = AsyncIOMotorClient(mongo_url, tz_aware=True)
     db = client["test_database"]
     
     session_token = "session_admin_backend_format"
@@ -25,7 +25,9 @@ async def test_db_queries():
     if session:
         # Check expiration like the backend does
         try:
-            expires_at = datetime.fromisoformat(session['expires_at'])
+            expires_at = session['expires_at']
+            if isinstance(expires_at, str):
+                expires_at = datetime.fromisoformat(expires_at)
             now = datetime.now(timezone.utc)
             is_expired = expires_at < now
             print(f"Expires at: {expires_at}")
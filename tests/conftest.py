@@ -0,0 +1,22 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# server reads these at import time; only fill them in when the caller has not
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory Mongo database swapped in for server.db"""
+    mock_db = AsyncMongoMockClient(tz_aware=True)["test_database"]
+    monkeypatch.setattr(server, "db", mock_db)
+    server.session_cache.clear()
+    return mock_db
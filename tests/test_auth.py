@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+import server
+
+
+def test_current_user_with_datetime_created_at(db):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    async def run():
+        await db.users.insert_one({
+            "id": "user-1",
+            "email": "user@example.com",
+            "name": "User",
+            "role": "attendee",
+            "created_at": now,
+        })
+        await db.user_sessions.insert_one({
+            "user_id": "user-1",
+            "session_token": "tok",
+            "expires_at": now + timedelta(days=1),
+        })
+        return await server.get_current_user(Request({"type": "http", "headers": []}), authorization="Bearer tok")
+
+    user = asyncio.run(run())
+
+    assert user is not None
+    assert user.id == "user-1"
+    assert datetime.fromisoformat(user.created_at) == now
+
+
+class _AuthResponse:
+    status_code = 200
+
+    def json(self):
+        return {"email": "new@example.com", "name": "New", "session_token": "tok-new"}
+
+
+class _AuthClient:
+    async def get(self, url, headers):
+        return _AuthResponse()
+
+
+def test_repeated_session_exchange_is_idempotent(db, monkeypatch):
+    monkeypatch.setattr(server, "auth_client", _AuthClient())
+
+    async def exchange():
+        request = Request({"type": "http", "headers": [(b"x-session-id", b"sid")]})
+        return await server.create_session(request, Response())
+
+    async def run():
+        await server.create_indexes()
+        first, second = await exchange(), await exchange()
+        return (
+            first, second,
+            await db.users.count_documents({"email": "new@example.com"}),
+            await db.user_sessions.count_documents({"session_token": "tok-new"}),
+        )
+
+    first, second, users, sessions = asyncio.run(run())
+
+    assert first == {"success": True, "is_new_user": True}
+    assert second == {"success": True, "is_new_user": False}
+    assert users == 1 and sessions == 1
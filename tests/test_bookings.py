@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import server
+
+
+class _CheckoutSessions:
+    async def retrieve_async(self, session_id):
+        return SimpleNamespace(status="complete", payment_status="paid", amount_total=2000, currency="usd")
+
+
+@pytest.fixture
+def stripe_paid(monkeypatch):
+    monkeypatch.setattr(server, "stripe_client", SimpleNamespace(checkout=SimpleNamespace(sessions=_CheckoutSessions())))
+
+
+def _user(user_id):
+    return server.User(id=user_id, email=f"{user_id}@example.com", name=user_id)
+
+
+async def _seed(db, seats=1, price=20.0):
+    await db.events.insert_one({"id": "event-1", "status": "active"})
+    await db.ticket_types.insert_one({
+        "id": "tt-1", "event_id": "event-1", "name": "VIP", "price": price,
+        "quantity_available": seats, "quantity_sold": 0
+    })
+
+
+async def _book(user_id, session_id=None):
+    result = await server.create_booking(
+        server.BookingCreate(event_id="event-1", ticket_type_id="tt-1", quantity=1), _user(user_id)
+    )
+    booking = result["booking"]
+    if session_id:
+        await server.db.payment_transactions.insert_one({
+            "session_id": session_id, "booking_id": booking.id, "payment_status": "pending"
+        })
+        await server.db.bookings.update_one({"id": booking.id}, {"$set": {"payment_intent_id": session_id}})
+    return booking
+
+
+async def _sold(db):
+    return (await db.ticket_types.find_one({"id": "tt-1"}))["quantity_sold"]
+
+
+def test_paid_booking_holds_the_last_seat(db):
+    async def run():
+        await _seed(db)
+        booking = await _book("buyer-1")
+        with pytest.raises(HTTPException) as exc:
+            await _book("buyer-2")
+        return booking, exc.value, await _sold(db)
+
+    booking, error, sold = asyncio.run(run())
+
+    assert booking.status == "pending" and booking.hold_expires_at is not None
+    assert error.status_code == 400
+    assert sold == 1
+
+
+def test_unknown_ticket_type_is_not_found(db):
+    async def run():
+        await db.events.insert_one({"id": "event-1", "status": "active"})
+        with pytest.raises(HTTPException) as exc:
+            await _book("buyer-1")
+        return exc.value
+
+    assert asyncio.run(run()).status_code == 404
+
+
+def test_payment_confirmation_is_idempotent(db, stripe_paid):
+    async def run():
+        await _seed(db)
+        booking = await _book("buyer-1", "cs_1")
+        first = await server.check_payment_status("cs_1", _user("buyer-1"))
+        stored = await db.bookings.find_one({"id": booking.id})
+        second = await server.check_payment_status("cs_1", _user("buyer-1"))
+        again = await server.confirm_paid_booking(booking.id)
+        return first, second, again, stored, await db.bookings.find_one({"id": booking.id}), await _sold(db)
+
+    first, second, again, stored, final, sold = asyncio.run(run())
+
+    assert first["booking_status"] == "confirmed"
+    assert second == {"status": "completed", "payment_status": "paid", "booking_status": "confirmed"}
+    assert again == "confirmed"
+    assert final["qr_code_data"] == stored["qr_code_data"]
+    assert "hold_expires_at" not in final
+    assert sold == 1
+
+
+def test_expired_hold_releases_the_seat(db):
+    async def run():
+        await _seed(db)
+        booking = await _book("buyer-1")
+        await db.bookings.update_one(
+            {"id": booking.id}, {"$set": {"hold_expires_at": datetime.now(timezone.utc) - timedelta(minutes=1)}}
+        )
+        await server.release_expired_holds()
+        await server.release_expired_holds()
+        released = await db.bookings.find_one({"id": booking.id})
+        sold_after_release = await _sold(db)
+        await _book("buyer-2")
+        return released, sold_after_release, await _sold(db)
+
+    released, sold_after_release, sold = asyncio.run(run())
+
+    assert released["status"] == "cancelled"
+    assert sold_after_release == 0
+    assert sold == 1
+
+
+def test_payment_after_lapsed_hold_is_flagged_when_sold_out(db, stripe_paid):
+    async def run():
+        await _seed(db)
+        booking = await _book("buyer-1", "cs_1")
+        await server.release_booking_hold({"id": booking.id})
+        await _book("buyer-2")
+        status = await server.check_payment_status("cs_1", _user("buyer-1"))
+        return (
+            status,
+            await db.bookings.find_one({"id": booking.id}),
+            await db.payment_transactions.find_one({"session_id": "cs_1"}),
+            await _sold(db),
+        )
+
+    status, booking, transaction, sold = asyncio.run(run())
+
+    assert status["payment_status"] == "paid"
+    assert status["booking_status"] == "refund_required"
+    assert booking["status"] == "refund_required"
+    assert transaction["payment_status"] == "paid"
+    assert sold == 1
+
+
+def test_payment_after_lapsed_hold_reserves_a_free_seat(db, stripe_paid):
+    async def run():
+        await _seed(db)
+        booking = await _book("buyer-1", "cs_1")
+        await server.release_booking_hold({"id": booking.id})
+        status = await server.check_payment_status("cs_1", _user("buyer-1"))
+        return status, await db.bookings.find_one({"id": booking.id}), await _sold(db)
+
+    status, booking, sold = asyncio.run(run())
+
+    assert status["booking_status"] == "confirmed"
+    assert booking["status"] == "confirmed" and booking["qr_code_data"]
+    assert sold == 1
+
+
+def _webhook_request(body=b"{}"):
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+    return Request({"type": "http", "method": "POST", "headers": [(b"stripe-signature", b"t=1,v1=bad")]}, receive)
+
+
+@pytest.mark.parametrize("client, secret", [(None, "whsec_test"), (SimpleNamespace(), None)])
+def test_unconfigured_webhook_is_unavailable(db, monkeypatch, client, secret):
+    monkeypatch.setattr(server, "stripe_client", client)
+    monkeypatch.setattr(server, "stripe_webhook_secret", secret)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(server.stripe_webhook(_webhook_request()))
+    assert exc.value.status_code == 503
+
+
+def test_webhook_with_bad_signature_is_rejected(db, monkeypatch):
+    monkeypatch.setattr(server, "stripe_client", server.stripe.StripeClient("sk_test_x"))
+    monkeypatch.setattr(server, "stripe_webhook_secret", "whsec_test")
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(server.stripe_webhook(_webhook_request()))
+    assert exc.value.status_code == 400
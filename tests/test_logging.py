@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+
+async def _aclose():
+    pass
+
+
+@pytest.fixture
+def closable_clients(monkeypatch):
+    monkeypatch.setattr(server, "client", SimpleNamespace(close=lambda: None))
+    monkeypatch.setattr(server, "auth_client", SimpleNamespace(aclose=_aclose))
+    monkeypatch.setattr(server, "redis_client", None)
+
+
+def test_import_does_not_queue_records():
+    server.logger.warning("logged without the app running")
+
+    assert server.log_queue_handler not in logging.getLogger().handlers
+    assert server.log_queue.empty()
+
+
+def test_shutdown_without_startup(closable_clients):
+    asyncio.run(server.shutdown_db_client())
+
+
+def test_listener_drains_records_on_shutdown(closable_clients):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    server.log_listener.handlers = (handler,)
+    try:
+        async def run():
+            await server.start_log_listener()
+            server.logger.warning("queued while running")
+            await server.shutdown_db_client()
+        asyncio.run(run())
+    finally:
+        server.log_listener.handlers = (server.log_stream_handler,)
+
+    assert [r.getMessage() for r in records] == ["queued while running"]
+    assert server.log_queue_handler not in logging.getLogger().handlers